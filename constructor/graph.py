@@ -1,10 +1,61 @@
 #!/usr/bin/env python3
 
-from .pedigree import Node
+from .pedigree import Node, deepcopy_graph, _visit_nodes
 from typing import List
 
 class Graph:
-    def __init__(node_list: List[Node]) -> None:
+    __slots__ = ('node_list', 'node_mapping', 'node_set')
+
+    def __init__(self, node_list: List[Node]) -> None:
+        """
+            Constructs a graph over the given nodes. The nodes are
+            referenced directly rather than deep copied; copy the graph
+            itself when an independent instance is needed. The node
+            list and id mapping are built together in a single pass.
+        """
+        self.node_list = []
+        self.node_mapping = {}
+        for node in node_list:
+            if node.id not in self.node_mapping:
+                self.node_mapping[node.id] = node
+                self.node_list.append(node)
+
+        # Live view over the mapping; O(1) membership with no copy.
+        self.node_set = self.node_mapping.keys()
+
+    def __str__(self):
+        """
+            String representation for debugging. Built with a single
+            join rather than repeated concatenation.
+        """
+        return ' '.join(node.id for node in self.node_list)
+
+    def get_node(self, id: str) -> Node:
+        """
+            Returns the node with the given `id`, or None.
+        """
+        return self.node_mapping.get(id)
+
+    def update_nodes(self) -> None:
+        """
+            Refreshes the node list and id mapping by breadth first
+            traversal from the current nodes, picking up any relatives
+            linked in since construction.
+        """
+        self.node_list = _visit_nodes(self.node_list)
+        self.node_mapping = {node.id: node for node in self.node_list}
+        self.node_set = self.node_mapping.keys()
+
+    def __deepcopy__(self, memo) -> 'Graph':
+        """
+            Copies the graph without the generic `copy.deepcopy`
+            machinery. Nodes are cloned field by field and rewired by
+            id via `deepcopy_graph`; the mapping is rebuilt from the
+            copied list in one pass.
         """
-            Constructs a graph that is a deep copy of the given node list.
-        """
\ No newline at end of file
+        copied = Graph.__new__(Graph)
+        copied.node_list = deepcopy_graph(self.node_list)
+        copied.node_mapping = {node.id: node for node in copied.node_list}
+        copied.node_set = copied.node_mapping.keys()
+        memo[id(self)] = copied
+        return copied
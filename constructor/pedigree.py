@@ -3,16 +3,34 @@
 """ For traversing the pedigree and other related operations. """
 
 from __future__ import annotations
+import gc
 import re
-from contextlib import contextmanager
+import sys
+from collections import deque
+from itertools import product
 #`from constructor.util import visualize_graph
-from copy import deepcopy
-from typing import Tuple, List, Dict, Set, Optional
+from typing import Iterator, Tuple, List, Dict, Set, Optional
 
 AGE_DEFAULT = 100
 DEGREE_CAP = 4
 MAX = 3
+
+# Bumped on every structural mutation so that cached relative
+# lists can be invalidated cheaply.
+_graph_generation = 0
+
+def _bump_generation() -> None:
+    global _graph_generation
+    _graph_generation += 1
+
 class Node:
+    __slots__ = (
+        'id', 'female', 'mt_dna', 'y_chrom', 'age', 'occupied',
+        'original', 'parents', 'children', 'partners', 'siblings',
+        '_fdr_cache', '_sdr_cache', '_desc_cache',
+        '_gen', '_sdr_gen', '_desc_gen'
+    )
+
     filler_id = 0
     def __init__(
         self,
@@ -42,7 +60,10 @@ class Node:
                 `siblings`: full siblings of the current node.
         """
         self.female = female
-        self.mt_dna = mt_dna
+        # Haplotype labels come from a tiny alphabet; interning them
+        # lets the equality checks in the hot dispatch take the
+        # pointer fast path.
+        self.mt_dna = sys.intern(mt_dna) if mt_dna is not None else None
         self.age = age
         self.occupied = occupied
         self.original = original
@@ -58,24 +79,61 @@ class Node:
         if female:
             assert y_chrom is None
 
-        self.y_chrom = y_chrom
+        self.y_chrom = sys.intern(y_chrom) if y_chrom is not None else None
         self.siblings = siblings if siblings is not None else []
         self.partners = partners if partners is not None else []
-        self.id = id
-    
+        # Ids are used as dict keys all over the search; interning makes
+        # their hashes cached and equality a pointer check.
+        self.id = sys.intern(id)
+
+        # Cached first degree relatives and descendant set, valid
+        # while `_gen` matches the module-level generation counter.
+        self._fdr_cache = None
+        self._sdr_cache = None
+        self._desc_cache = None
+        self._gen = -1
+        self._sdr_gen = -1
+        self._desc_gen = -1
+
     def __str__(self):
         """
             String representation for debugging.
         """
-        return f'id: {self.id}\n' + \
-               f'gender: {"F" if self.female else "M"}\n' + \
-               f'mtDna: {self.mt_dna}\n' + \
-               f'yChrom: {self.y_chrom}\n' + \
+        return f'id: {self.id}\n' \
+               f'gender: {"F" if self.female else "M"}\n' \
+               f'mtDna: {self.mt_dna}\n' \
+               f'yChrom: {self.y_chrom}\n' \
                f'age: {self.age}\n'
 
     def is_given(self):
         return self.original
 
+    def _shallow_clone(self) -> Node:
+        """
+            Returns a copy of this node carrying the same scalar
+            attributes but no connections. Cheaper than a generic
+            `deepcopy` since it skips the memo/dispatch machinery.
+        """
+        clone = Node.__new__(Node)
+        clone.id = self.id
+        clone.female = self.female
+        clone.mt_dna = self.mt_dna
+        clone.y_chrom = self.y_chrom
+        clone.age = self.age
+        clone.occupied = self.occupied
+        clone.original = self.original
+        clone.parents = ()
+        clone.children = []
+        clone.partners = []
+        clone.siblings = []
+        clone._fdr_cache = None
+        clone._sdr_cache = None
+        clone._desc_cache = None
+        clone._gen = -1
+        clone._sdr_gen = -1
+        clone._desc_gen = -1
+        return clone
+
     def extrapolate(self):
         """
             Constructs surrounding nodes of a father, mother, two siblings of each gender,
@@ -102,27 +160,40 @@ class Node:
                 children=[self]
             )
             self.parents = (mother, father)
-        assert len(self.parents) == 2
+            _bump_generation()
 
     def search_descendants(self, nodes: List[Node]) -> bool:
         """
-            Searches children for the specified `node`. Returns
-            true if found, false otherwise. Requires that there
+            Searches descendants for any of the specified `nodes`.
+            Returns true if found, false otherwise. Requires that there
             must not be a cycle in the graph.
         """
         if self.children is None or len(self.children) == 0:
             return False
-        for child in self.children:
-            if child in nodes:
-                return True
-            if child.search_descendants(nodes):
+        if self._desc_cache is None or self._desc_gen != _graph_generation:
+            visited = set()
+            stack = list(self.children)
+            while stack:
+                child = stack.pop()
+                if child in visited:
+                    continue
+                visited.add(child)
+                stack.extend(child.children)
+            self._desc_cache = visited
+            self._desc_gen = _graph_generation
+        descendants = self._desc_cache
+        for node in nodes:
+            if node in descendants:
                 return True
         return False
     
     def get_first_degree_rel(self) -> List[Node]:
         """
             Returns all first degree relatives of the current node.
+            Cached until the next structural mutation.
         """
+        if self._fdr_cache is not None and self._gen == _graph_generation:
+            return self._fdr_cache
         ret = []
 
         # Parents.
@@ -136,15 +207,20 @@ class Node:
         # Siblings.
         if (self.parents != None and len(self.parents) == 2):
             for child in self.parents[0].children:
-                if child.parents[1] == self.parents[1] and child != self:
+                if child.parents[1] is self.parents[1] and child is not self:
                     ret.append(child)
 
+        self._fdr_cache = ret
+        self._gen = _graph_generation
         return ret
     
     def get_second_degree_rel(self) -> List[Node]:
         """
             Returns all second degree relatives of the current node.
+            Cached until the next structural mutation.
         """
+        if self._sdr_cache is not None and self._sdr_gen == _graph_generation:
+            return self._sdr_cache
 
         ret = []
 
@@ -152,9 +228,12 @@ class Node:
         for node in first:
             layer = set(node.get_first_degree_rel())
             for second in layer:
-                if second != self and second not in first \
+                if second is not self and second not in first \
                    and second not in node.parents:
                    ret.append(second)
+
+        self._sdr_cache = ret
+        self._sdr_gen = _graph_generation
         return ret
             
     
@@ -192,19 +271,19 @@ def _visit_nodes(node_list: List[Node]) -> List[Node]:
             temp.append(node)
     if (len(temp) != len(node_list)):
         return _visit_nodes(temp)
-    visited = set()
-    copy_list = [node for node in node_list]
+    visited = set(node_list)
+    queue = deque(node_list)
 
     def visit_edges(relations: List[Node]):
         for relative in relations:
             if relative not in visited:
                 visited.add(relative)
-                copy_list.append(relative)
+                queue.append(relative)
 
-    # BFS search to get all the nodes in the visited set.
-    while len(copy_list) > 0:
-        node = copy_list.pop()
-        visited.add(node)
+    # BFS search to get all the nodes in the visited set. Nodes are
+    # marked visited at enqueue time so each is pushed exactly once.
+    while queue:
+        node = queue.popleft()
 
         # Sufficient to visit only parents and children.
         visit_edges(node.parents)
@@ -216,150 +295,191 @@ def _assign_helper(
         relation: List[Tuple[str, str]],
         node_map: Dict[str, Node],
         node_list: List[Node],
-        all_possible: List[List[Node]],
         idx: int
-    ) -> None:
+    ) -> Iterator[List[Node]]:
+    """
+        Explores every plausible assignment of the pairwise relations
+        starting at `idx`, yielding the live graph once per complete
+        configuration. Consumers must snapshot any graph they keep
+        before the next one is pulled; the pruning stage does so for
+        survivors only, which skips the copy for pruned branches. Runs
+        as an iterative DFS with an explicit undo stack so no Python
+        frame or context manager is paid per decision.
+    """
     if relation is None or idx == len(relation):
-        all_possible.append(deepcopy_graph(node_list))
+        yield node_list
         return
 
-    src, dest = relation[idx]
-    # We want to be able to get back to our original state,
-    # cache the original relationships for both destination
-    # and source.
-    src_node = deepcopy(node_map.get(src))
-    dest_node = deepcopy(node_map.get(dest))
-
-    src = node_map.get(src)
-    dest = node_map.get(dest)
-
-    share_mt_dna = src.mt_dna == dest.mt_dna
-    one_is_none = src.mt_dna is None or dest.mt_dna is None
-
-    # ------ ASSIGNMENTS ------
-
-    # Case that source and dest are both male.
-    if not src.female and not dest.female:
-
-        share_y = src.y_chrom == dest.y_chrom
-        one_chrom_none = src.y_chrom is None or dest.y_chrom is None
-
-        if (share_y or one_chrom_none) and (share_mt_dna or one_is_none):
-            # Must be siblings.
-            with _assign_sibling(src, dest) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-        if (share_y or one_chrom_none) and (one_is_none or not share_mt_dna):
-            # Either father/son or son/father.
-            # Father/son first.
-            with _assign_parental(dest, src) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-            # Son/father.
-            with _assign_parental(src, dest) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-        else:
-            # No configuration works here.
-            return
-
-    # Case that one is female and the other is male.
-    elif (not src.female and dest.female) or \
-         (src.female and not dest.female):
-
-            male_node = src if dest.female else dest
-            female_node = src if src.female else dest
-            if share_mt_dna or one_is_none:
-
-                # Either siblings or son/mother.
-
-                # Case 1 siblings.
-                with _assign_sibling(male_node, female_node) as ok:
-                    if ok:
-                        _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-
-                # Case 2 parental.
-                with _assign_parental(male_node, female_node) as ok:
-                    if ok:
-                        _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-                
-            if not share_mt_dna:
-                # Don't share mtDNA. Must be father/daughter.
-                with _assign_parental(female_node, male_node) as ok:
-                    if ok:
-                        _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-
-    # Case that source and dest are both females.
+    total = len(relation)
+
+    if idx < total - 1:
+        # Most constrained pairs first: putting the relations with the
+        # fewest plausible assignments near the root kills dead
+        # branches before they fan out. The estimate uses the starting
+        # state, which is exact for the first decision and a good
+        # proxy afterwards.
+        relation = relation[:idx] + sorted(
+            relation[idx:],
+            key=lambda rel: len(_candidate_assignments(rel, node_map))
+        )
+
+    def candidates(i: int):
+        return iter(_candidate_assignments(relation[i], node_map))
+
+    # Each stack entry holds the candidate iterator for its depth and
+    # the undo of the assignment that opened the frame.
+    stack = [(candidates(idx), None)]
+    while stack:
+        it = stack[-1][0]
+        depth = idx + len(stack) - 1
+        descended = False
+        for apply_fn, first, second in it:
+            undo = apply_fn(first, second)
+            if not undo:
+                continue
+            if depth + 1 == total:
+                yield node_list
+                undo()
+                continue
+            stack.append((candidates(depth + 1), undo))
+            descended = True
+            break
+        if not descended:
+            _, undo = stack.pop()
+            if undo is not None:
+                undo()
+
+def _candidate_assignments(
+        rel: Tuple[str, str],
+        node_map: Dict[str, Node]
+    ) -> List[Tuple]:
+    """
+        Returns the (apply_fn, first, second) assignment attempts that
+        are genetically plausible for the given pair in the graph's
+        current state.
+    """
+    src = node_map[rel[0]]
+    dest = node_map[rel[1]]
+
+    src_female = src.female
+    dest_female = dest.female
+    src_mt = src.mt_dna
+    dest_mt = dest.mt_dna
+    share_mt_dna = src_mt == dest_mt
+    one_is_none = src_mt is None or dest_mt is None
+
+    if not src_female and not dest_female:
+        src_y = src.y_chrom
+        dest_y = dest.y_chrom
+        y_compat = src_y == dest_y or src_y is None or dest_y is None
+        first, second = src, dest
+    elif src_female != dest_female:
+        # The table entries for mixed pairs are written over the
+        # (male, female) ordering.
+        y_compat = True
+        first = src if dest_female else dest
+        second = src if src_female else dest
     else:
-        if share_mt_dna or one_is_none:
-            # May be siblings or daughter/mother or mother/daughter.
-            
-            # Case 1 siblings.
-            with _assign_sibling(src, dest) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-            
-            # Case 2 daughter/mother.
-            with _assign_parental(src, dest) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-
-            # Case 3 mother/daugther.
-            with _assign_parental(dest, src) as ok:
-                if ok:
-                    _assign_helper(relation, node_map, node_list, all_possible, idx + 1)
-        else:
-            # No configuration works here.
-            return
+        y_compat = True
+        first, second = src, dest
+
+    entries = _CANDIDATE_TABLE[
+        (src_female, dest_female, share_mt_dna, one_is_none, y_compat)
+    ]
+    return [
+        (fn, second, first) if flip else (fn, first, second)
+        for fn, flip in entries
+    ]
+
+def _build_candidate_table() -> Dict[Tuple, Tuple]:
+    """
+        Enumerates every combination of the gender/mtDNA/yChrom
+        compatibility flags once, recording which assignment attempts
+        are plausible for each. Entries are (apply_fn, flip) pairs over
+        the normalized operand ordering picked in
+        `_candidate_assignments`; a flipped entry swaps the operands.
+    """
+    flags = (False, True)
+    table = {}
+    for src_female in flags:
+        for dest_female in flags:
+            for share_mt_dna in flags:
+                for one_is_none in flags:
+                    for y_compat in flags:
+                        entries = []
+                        if not src_female and not dest_female:
+                            # Both male: sibling, then father/son,
+                            # then son/father.
+                            if y_compat and (share_mt_dna or one_is_none):
+                                entries.append((_apply_sibling, False))
+                            if y_compat and (one_is_none or not share_mt_dna):
+                                entries.append((_apply_parental, True))
+                                entries.append((_apply_parental, False))
+                        elif src_female != dest_female:
+                            # Mixed: sibling or son/mother, else
+                            # father/daughter.
+                            if share_mt_dna or one_is_none:
+                                entries.append((_apply_sibling, False))
+                                entries.append((_apply_parental, False))
+                            if not share_mt_dna:
+                                entries.append((_apply_parental, True))
+                        else:
+                            # Both female: sibling, daughter/mother,
+                            # mother/daughter.
+                            if share_mt_dna or one_is_none:
+                                entries.append((_apply_sibling, False))
+                                entries.append((_apply_parental, False))
+                                entries.append((_apply_parental, True))
+                        key = (
+                            src_female, dest_female,
+                            share_mt_dna, one_is_none, y_compat
+                        )
+                        table[key] = tuple(entries)
+    return table
 
 # ------ ASSIGNMENT SUBHELPER METHODS ------
 
-@contextmanager
-def _assign_parental (child: Node, parent: Node) -> None:
+def _undo_noop() -> None:
+    """ Undo for assignments that confirmed an existing relationship. """
+    pass
+
+def _apply_parental (child: Node, parent: Node):
     """
-        Helper function for assigning parental relationships between
-        `child` and `parent`. Returns the Node tuple of the original
-        parents of `child`. Returned value is used to backtrack.
+        Attempts to assign `parent` as a parent of `child`. Returns a
+        zero-argument undo callable on success (a no-op one when the
+        relationship already holds) and False when impossible.
     """
-    assert(child is not None)
-    assert(parent is not None)
-    assert(child.parents is not None)
-    assert(parent.children is not None)
-
     orig_mother = child.parents[0]
     orig_father = child.parents[1]
 
-    if child.parents[0] == parent.parents[0] and \
-       child.parents[1] == parent.parents[1]:
-        yield False
-        return
+    if child.parents[0] is parent.parents[0] and \
+       child.parents[1] is parent.parents[1]:
+        return False
     if parent is orig_mother or parent is orig_father:
-        yield True
-        return
+        return _undo_noop
 
     if child is parent.parents[0] or child is parent.parents[1]:
-        yield False
-        return
+        return False
 
     if (orig_mother.occupied and parent.female) or \
        (orig_father.occupied and not parent.female):
-       yield False
-       return
+       return False
 
-    # Begin assignment.
+    # Begin assignment. Children are only ever appended below, so a
+    # length snapshot is enough to roll the list back.
     to_replace = orig_father if not parent.female else orig_mother
-    orig_parent_children = [node for node in parent.children]
+    orig_parent_len = len(parent.children)
 
     # Cycle detection first.
     for child in to_replace.children:
         if child.search_descendants([parent]):
-            yield False
-            return
+            return False
 
     for child in to_replace.children:
         child.parents = (parent, child.parents[1]) if parent.female else (child.parents[0], parent)
         parent.children.append(child)
-    
+    _bump_generation()
+
     orig_mt = child.mt_dna
     orig_ychrom = child.y_chrom
 
@@ -368,52 +488,51 @@ def _assign_parental (child: Node, parent: Node) -> None:
     if not child.female and child.y_chrom is None and not parent.female:
         child.y_chrom = parent.y_chrom
 
-    yield True
+    last = child
 
-    child.mt_dna = orig_mt
-    child.y_chrom = orig_ychrom
+    def undo() -> None:
+        last.mt_dna = orig_mt
+        last.y_chrom = orig_ychrom
 
-    parent.children = orig_parent_children
-    for child in to_replace.children:
-        child.parents = (to_replace, child.parents[1]) if to_replace.female else (child.parents[0], to_replace)
+        del parent.children[orig_parent_len:]
+        for child in to_replace.children:
+            child.parents = (to_replace, child.parents[1]) if to_replace.female else (child.parents[0], to_replace)
+        _bump_generation()
 
-@contextmanager
-def _assign_sibling (sib1: Node, sib2: Node) -> None:
+    return undo
+
+def _apply_sibling (sib1: Node, sib2: Node):
     """
-        Assigns `sib1` and `sib2` as siblings.
+        Attempts to assign `sib1` and `sib2` as siblings. Returns a
+        zero-argument undo callable on success (a no-op one when the
+        relationship already holds) and False when impossible.
     """
-    sib1_parents = sib1.parents
-    sib2_parents = sib2.parents
+    mother1, father1 = sib1.parents
+    mother2, father2 = sib2.parents
 
     mother = None
     father = None
 
-    assert(sib1_parents is not None)
-    assert(sib2_parents is not None)
-
     if sib1.search_descendants([sib2]) or sib2.search_descendants([sib1]):
-        yield False
-        return
+        return False
     # Confirming existing relationship
-    if sib1_parents[0] == sib2_parents[0] and \
-    sib1_parents[1] == sib2_parents[1]:
-        yield True
-        return
+    if mother1 is mother2 and father1 is father2:
+        return _undo_noop
 
-    all_parents = sib1_parents + sib2_parents
-    all_parents = list({node for node in all_parents if node.occupied})
+    all_parents = list({
+        node for node in (mother1, father1, mother2, father2)
+        if node.occupied
+    })
 
     if len(all_parents) > 2:
         # More than two unique occupied nodes, impossible to merge.
-        yield False
-        return
+        return False
 
     if len(all_parents) == 2:
         # Exactly two occupied parents.
         if all_parents[0].female == all_parents[1].female:
             # Same gender, wrong configuration.
-            yield False
-            return
+            return False
 
         father = all_parents[0] if all_parents[1].female else all_parents[1]
         mother = all_parents[0] if all_parents[0].female else all_parents[1]
@@ -422,53 +541,41 @@ def _assign_sibling (sib1: Node, sib2: Node) -> None:
         if all_parents[0].female:
             mother = all_parents[0]
             # Should use the father of the male child if there is one.
-            father = sib1_parents[1] if not sib1.female else sib2_parents[1]
+            father = father1 if not sib1.female else father2
         else:
             father = all_parents[0]
             # Using any mother should be ok.
-            mother = sib1_parents[0]
+            mother = mother1
     else:
         # No occupied parents, anything goes as long as we reserve one father
         # from the male sibling.
-        father = sib1_parents[1] if not sib1.female else sib2_parents[1]
-        mother = sib1_parents[0]
-    
-    orig_mother_children = [child for child in mother.children]
-    orig_father_children = [child for child in father.children]
+        father = father1 if not sib1.female else father2
+        mother = mother1
 
-    father_to_delete = sib1_parents[1] if sib1_parents[1] is not father else sib2_parents[1]
-    mother_to_delete = sib1_parents[0] if sib1_parents[0] is not mother else sib2_parents[0]
+    # Children are only appended to the surviving parents below, so
+    # length snapshots are enough to roll the lists back. The children
+    # lists of the replaced parents are never mutated.
+    orig_mother_len = len(mother.children)
+    orig_father_len = len(father.children)
 
-    to_d_father_children = [child for child in father_to_delete.children]
-    to_d_mother_children = [child for child in mother_to_delete.children]
-    
-    # if sib1.search_entire_tree(sib2, set()):
-    #     yield False
-    #     return
-    # Check for cycles first.
+    father_to_delete = father1 if father1 is not father else father2
+    mother_to_delete = mother1 if mother1 is not mother else mother2
+
+    # Check for cycles first. One search per replaced parent suffices:
+    # its descendant set contains everything below its children, so
+    # the old per-child walks could never find a cycle this misses.
     if father_to_delete is not father:
         if father_to_delete.search_descendants([father, mother]):
-            yield False
-            return
-        for child in father_to_delete.children:
-            if child.search_descendants([father]):
-                yield False
-                return
+            return False
     if mother_to_delete is not mother:
         if mother_to_delete.search_descendants([father, mother]):
-            yield False
-            return
-        for child in mother_to_delete.children:
-            if child.search_descendants([mother]):
-                yield False
-                return
+            return False
 
     sibs = [sib1, sib2]
     for sib in sibs:
         if not sib.female and sib.y_chrom is not None:
             if sib.y_chrom != father.y_chrom:
-                yield False
-                return
+                return False
 
     if father_to_delete is not father:
         for child in father_to_delete.children:
@@ -479,7 +586,8 @@ def _assign_sibling (sib1: Node, sib2: Node) -> None:
         for child in mother_to_delete.children:
             mother.children.append(child)
             child.parents = (mother, child.parents[1])
- 
+    _bump_generation()
+
     sib1_orig_mt = sib1.mt_dna
     sib2_orig_mt = sib2.mt_dna
 
@@ -494,79 +602,71 @@ def _assign_sibling (sib1: Node, sib2: Node) -> None:
         to_assign_ychrom = sib1_orig_ychrom if sib1_orig_ychrom is not None else sib2_orig_ychrom
         sib1.y_chrom = to_assign_ychrom
         sib2.y_chrom = to_assign_ychrom
-    
+
     father_orig_ychrom = father.y_chrom
     if father.y_chrom is None:
         to_assign = sib1.y_chrom if not sib1.female else sib2.y_chrom
         father.y_chrom = to_assign
-    yield True
 
-    sib1.mt_dna = sib1_orig_mt
-    sib2.mt_dna = sib2_orig_mt
+    def undo() -> None:
+        sib1.mt_dna = sib1_orig_mt
+        sib2.mt_dna = sib2_orig_mt
 
-    sib1.y_chrom = sib1_orig_ychrom
-    sib2.y_chrom = sib2_orig_ychrom
+        sib1.y_chrom = sib1_orig_ychrom
+        sib2.y_chrom = sib2_orig_ychrom
 
-    father.y_chrom = father_orig_ychrom
-    father.children = orig_father_children
-    mother.children = orig_mother_children
+        father.y_chrom = father_orig_ychrom
+        del father.children[orig_father_len:]
+        del mother.children[orig_mother_len:]
 
-    father_to_delete.children = to_d_father_children
-    mother_to_delete.children = to_d_mother_children
+        for child in father_to_delete.children:
+            child.parents = (child.parents[0], father_to_delete)
+        for child in mother_to_delete.children:
+            child.parents = (mother_to_delete, child.parents[1])
+        _bump_generation()
 
-    for child in to_d_father_children:
-        child.parents = (child.parents[0], father_to_delete)
-    for child in to_d_mother_children:
-        child.parents = (mother_to_delete, child.parents[1])
+    return undo
+
+_CANDIDATE_TABLE = _build_candidate_table()
 
 def _reduce_relation (first: Node, second: Node) -> List[Tuple[str, str]]:
     """
         Reduces relationship of first and second node by one degree. Returns
         all possible pairwise arrangements.
     """
-    ret = []
-    first_rel = first.get_first_degree_rel()
-    for node in first_rel:
-        if node.id is second.id:
-            continue
-        assert(node.id is not second.id)
-        ret.append((second.id, node.id))
-    second_rel = second.get_first_degree_rel()
-    for node in second_rel:
-        if node.id is first.id:
-            continue
-        assert(node.id is not first.id)
-        ret.append((first.id, node.id))
+    first_id = first.id
+    second_id = second.id
+    ret = [
+        (second_id, node.id)
+        for node in first.get_first_degree_rel() if node.id is not second_id
+    ]
+    ret += [
+        (first_id, node.id)
+        for node in second.get_first_degree_rel() if node.id is not first_id
+    ]
     return ret
 
 def _validate_graph3(
     third_degrees: List[Tuple[str, str]],
     node_map: Dict[str, Node],
     occupied_nodes: List[Node],
-    all_possible: List[List[Node]]
-) -> List[List[Node]]:
+    all_possible: List[List[Node]],
+    extrap: bool
+) -> Iterator[List[Node]]:
     """
         Prunes graphs that assign third degree relationships to nodes
         that were not described in original pairwise relationships.
     """
 
     if third_degrees is None:
-        return all_possible
+        return (_finalize_graph(graph, extrap, False) for graph in all_possible)
 
-    mapping = {}
-    for node in occupied_nodes:
-        lst = []
-        mapping.update({node.id : lst})
-    
+    mapping = {node.id: [] for node in occupied_nodes}
     for rel in third_degrees:
-        lst = mapping.get(rel[0])
-        lst.append(rel[1])
-        mapping.update({rel[0] : lst})
-
-        lst1 = mapping.get(rel[1])
-        lst1.append(rel[0])
-        mapping.update({rel[1] : lst1})
-    ret = []
+        mapping[rel[0]].append(rel[1])
+        mapping[rel[1]].append(rel[0])
+    # Frozen for O(1) membership in the check below.
+    mapping = {key: frozenset(rels) for key, rels in mapping.items()}
 
     def _check_graph(graph: List[Node]) -> bool:
         for node in graph:
@@ -577,48 +677,38 @@ def _validate_graph3(
                 for rel in second_relatives:
                     layer_second_relatives = set(rel.get_first_degree_rel())
                     for third_rel in layer_second_relatives:
-                        if third_rel.is_given() and third_rel != node and third_rel not in first_relatives \
+                        if third_rel.is_given() and third_rel is not node and third_rel not in first_relatives \
                            and third_rel not in second_relatives and third_rel not in rel.parents:
-                           if third_rel.id not in mapping.get(node.id):
+                           if third_rel.id not in mapping[node.id]:
                                return False
         return True
 
-    # Begin pruning graphs.
-    for graph in all_possible:
-        if _check_graph(graph):
-            ret.append(graph)
-
-    return ret
+    # Begin pruning graphs, snapshotting survivors only.
+    return (_finalize_graph(graph, extrap, False)
+            for graph in all_possible if _check_graph(graph))
 
 
 def _prune_graphs3(
     third_degrees: List[Tuple[str, str]],
     node_map: Dict[str, Node],
     occupied_nodes: List[Node],
-    all_possible: List[List[Node]]
-) -> List[List[Node]]:
+    all_possible: List[List[Node]],
+    extrap: bool
+) -> Iterator[List[Node]]:
     """
         Prunes graphs that assign third degree relationships to nodes
         that were not described in original pairwise relationships.
     """
 
     if third_degrees is None:
-        return all_possible
+        return (_finalize_graph(graph, extrap, False) for graph in all_possible)
 
-    mapping = {}
-    for node in occupied_nodes:
-        lst = []
-        mapping.update({node.id : lst})
-    
+    mapping = {node.id: [] for node in occupied_nodes}
     for rel in third_degrees:
-        lst = mapping.get(rel[0])
-        lst.append(rel[1])
-        mapping.update({rel[0] : lst})
-
-        lst1 = mapping.get(rel[1])
-        lst1.append(rel[0])
-        mapping.update({rel[1] : lst1})
-    ret = []
+        mapping[rel[0]].append(rel[1])
+        mapping[rel[1]].append(rel[0])
+    # Frozen for O(1) membership in the check below.
+    mapping = {key: frozenset(rels) for key, rels in mapping.items()}
 
     def _check_graph(graph: List[Node]) -> bool:
         for node in graph:
@@ -629,183 +719,148 @@ def _prune_graphs3(
                 for rel in second_relatives:
                     layer_second_relatives = set(rel.get_first_degree_rel())
                     for third_rel in layer_second_relatives:
-                        if third_rel.is_given() and third_rel != node and third_rel not in first_relatives \
+                        if third_rel.is_given() and third_rel is not node and third_rel not in first_relatives \
                            and third_rel not in second_relatives and third_rel not in rel.parents:
-                           if third_rel.id not in mapping.get(node.id):
+                           if third_rel.id not in mapping[node.id]:
                                return False
         return True
 
-    # Begin pruning graphs.
-    for graph in all_possible:
-        if _check_graph(graph):
-            ret.append(graph)
-
-    return ret
+    # Begin pruning graphs, snapshotting survivors only.
+    return (_finalize_graph(graph, extrap, False)
+            for graph in all_possible if _check_graph(graph))
 
 
 def _prune_graphs2(
     second_degrees: List[Tuple[str, str]],
     node_map: Dict[str, Node],
     occupied_nodes: List[Node],
-    all_possible: List[List[Node]]
-) -> List[List[Node]]:
+    all_possible: List[List[Node]],
+    extrap: bool
+) -> Iterator[List[Node]]:
     """
         Prunes graphs that assign third degree relationships to nodes
         that were not described in original pairwise relationships.
     """
     if second_degrees is None:
-        return all_possible
+        return (_finalize_graph(graph, extrap, False) for graph in all_possible)
 
-    mapping = {}
-    for node in occupied_nodes:
-        lst = []
-        mapping.update({node.id : lst})
-    
+    mapping = {node.id: [] for node in occupied_nodes}
     for rel in second_degrees:
-        lst = mapping.get(rel[0])
-        lst.append(rel[1])
-        mapping.update({rel[0] : lst})
-
-        lst1 = mapping.get(rel[1])
-        lst1.append(rel[0])
-        mapping.update({rel[1] : lst1})
-    ret = []
+        mapping[rel[0]].append(rel[1])
+        mapping[rel[1]].append(rel[0])
+    # Frozen for O(1) membership in the check below.
+    mapping = {key: frozenset(rels) for key, rels in mapping.items()}
 
     def _check_graph(graph: List[Node]) -> bool:
+        # One relative set per node for the whole pass; the inner loop
+        # revisits the same nodes many times over.
+        first_sets = {node: set(node.get_first_degree_rel()) for node in graph}
         for node in graph:
             if node.is_given():
-                first_relatives = set(node.get_first_degree_rel())
+                first_relatives = first_sets[node]
                 for rel in first_relatives:
-                    layer_first_relatives = set(rel.get_first_degree_rel())
+                    layer_first_relatives = first_sets.get(rel)
+                    if layer_first_relatives is None:
+                        layer_first_relatives = set(rel.get_first_degree_rel())
+                        first_sets[rel] = layer_first_relatives
                     for second_rel in layer_first_relatives:
-                        if second_rel.is_given() and second_rel != node and second_rel not in first_relatives \
+                        if second_rel.is_given() and second_rel is not node and second_rel not in first_relatives \
                            and second_rel not in rel.parents:
-                            if second_rel.id not in mapping.get(node.id):
+                            if second_rel.id not in mapping[node.id]:
                                 return False
         return True
 
     # Begin pruning graphs.
-    for graph in all_possible:
-        if _check_graph(graph):
-            ret.append(graph)
-    for graph in ret:
-        for node in graph:
-            if node.y_chrom is None:
-                for child in node.children:
-                    if not child.female:
-                        node.y_chrom = child.y_chrom
-
-    return ret
+    return (_finalize_graph(graph, extrap, True)
+            for graph in all_possible if _check_graph(graph))
 
 def _prune_graphs(
     first_degrees: List[Tuple[str, str]],
     node_map: Dict[str, Node],
     occupied_nodes: List[Node],
-    all_possible: List[List[Node]]
-) -> List[List[Node]]:
+    all_possible: List[List[Node]],
+    extrap: bool
+) -> Iterator[List[Node]]:
     """
         Prunes graphs that assign first degree relationships to nodes
         that were not described in original pairwise relationships.
     """
     if first_degrees is None:
-        return all_possible
+        return (_finalize_graph(graph, extrap, False) for graph in all_possible)
     # Sort the first degrees.
-    mapping = {}
-    for node in occupied_nodes:
-        lst = []
-        mapping.update({node.id : lst})
-    
+    mapping = {node.id: [] for node in occupied_nodes}
     for rel in first_degrees:
-        lst = mapping.get(rel[0])
-        lst.append(rel[1])
-        mapping.update({rel[0] : lst})
-
-        lst1 = mapping.get(rel[1])
-        lst1.append(rel[0])
-        mapping.update({rel[1] : lst1})
-    ret = []
-    # mapped = map(lambda x: sorted(x), first_degrees)
-
-    # first_degree_map = {}
-    # for rel in mapped:
-    #     lst = first_degree_map.get(rel[0], [])
-    #     lst.append(rel[1])
-    #     first_degree_map.update({rel[0] : lst})
+        mapping[rel[0]].append(rel[1])
+        mapping[rel[1]].append(rel[0])
+    # Frozen for O(1) membership in the check below.
+    mapping = {key: frozenset(rels) for key, rels in mapping.items()}
 
     def _check_graph(graph: List[Node]) -> bool:
         for node in graph:
             if node.occupied:
-                first_relatives = node.get_first_degree_rel()
-                for rel in first_relatives:
-                    first, second = (rel.id, node.id) if rel.id < node.id else (node.id, rel.id)
-                    if rel.occupied and second not in mapping.get(first):
+                # The mapping holds both directions of every pair, so
+                # no id-order canonicalization is needed.
+                allowed = mapping[node.id]
+                for rel in node.get_first_degree_rel():
+                    if rel.occupied and rel.id not in allowed:
                         return False
         return True
 
     # Begin pruning graphs.
-    for graph in all_possible:
-        if _check_graph(graph):
-            ret.append(graph)
-
-    for graph in ret:
-        for node in graph:
-            if node.y_chrom is None:
-                for child in node.children:
-                    if not child.female:
-                        node.y_chrom = child.y_chrom
-    return ret
+    return (_finalize_graph(graph, extrap, True)
+            for graph in all_possible if _check_graph(graph))
 
-def _mark_and_extrapolate(graphs: List[List[Node]], extrap: bool) -> List[Node]:
-    """ Function for marking the unoccupied nodes and then extrapolating them. """
-    ret = []
+def _graph_signature(graph: List[Node]) -> frozenset:
+    """
+        Canonical signature of the parental assignments in a graph.
+        Two graphs with the same signature only differ in the order the
+        assignments were discovered, so one of them can be dropped.
+    """
+    return frozenset(
+        (node.id,
+         node.parents[0].id if len(node.parents) == 2 else None,
+         node.parents[1].id if len(node.parents) == 2 else None)
+        for node in graph
+    )
+
+def _unique_graphs(graphs) -> Iterator[List[Node]]:
+    """
+        Filters out graphs that repeat an already seen signature.
+        Different assignment orderings can produce identical graphs, and
+        recursing on duplicates multiplies work downstream.
+    """
+    seen = set()
     for graph in graphs:
-        for node in graph:
-            if not node.occupied:
-                node.occupied = True
-                if extrap:
-                    node.extrapolate()
-        ret.append(_visit_nodes(graph))
-    return ret
-
-def _relax_helper(
-    buffer: List[List[Tuple[str, str]]], 
-    idx: int, 
-    temp: List[Tuple[str, str]],
-    results: List[List[Tuple[str, str]]]
-) -> None:
+        sig = _graph_signature(graph)
+        if sig not in seen:
+            seen.add(sig)
+            yield graph
 
+def _finalize_graph(graph: List[Node], extrap: bool, fix_y: bool) -> List[Node]:
     """
-        Recursive helper for generating all possible pairwise combinations.
+        Snapshots a surviving candidate and performs the per-graph
+        bookkeeping in a single pass over its nodes: optionally fills
+        missing y chromosomes from male children, marks unoccupied nodes
+        (extrapolating them when requested), and rebuilds the complete
+        node list.
     """
+    graph = deepcopy_graph(graph)
 
-    if idx == len(buffer):
-        results.append(deepcopy(temp))
-        return
-    
-    current = buffer[idx]
-    for rel in current:
-        temp.append(rel)
-        _relax_helper(buffer, idx + 1, temp, results)
-        temp.pop()
-
-def _relax_helper2 (
-    buffer,
-    idx: int,
-    temp,
-    results
-) -> None:
-    """
-        Recursive helper for generating all pairwise relation
-        dictionaries. Results stored with dictionaries
-    """
-    if idx == len(buffer):
-        results.append(deepcopy(temp))
-        return
-    current = buffer[idx]
-    for possibility in current:
-        temp.update({idx + 1 : possibility})
-        _relax_helper2(buffer, idx + 1, temp, results)
-        temp.pop(idx + 1, None)
+    # deepcopy_graph already returns every reachable node, so the only
+    # additions to account for are the filler parents extrapolation
+    # creates; collecting them directly saves a second full BFS.
+    fillers = []
+    for node in graph:
+        if fix_y and node.y_chrom is None:
+            for child in node.children:
+                if not child.female:
+                    node.y_chrom = child.y_chrom
+        if not node.occupied:
+            node.occupied = True
+            if extrap and len(node.parents) == 0:
+                node.extrapolate()
+                fillers += node.parents
+    return graph + fillers
 
 def _relax_degree(
         graph: List[Node],
@@ -815,27 +870,26 @@ def _relax_degree(
         Decrements degrees by one, assigns a new relationship as well
         based on possible configurations.
     """
-    known = {}
-    for node in graph:
-        assert(node.id not in known.keys())
-        known.update({node.id: node})
-
-    pairwise_relations.pop(1, None)
+    known = {node.id: node for node in graph}
 
     possibilities = []
-    for degree in pairwise_relations.keys():
-        degree_possibilities = []
+    for degree, rels in pairwise_relations.items():
+        # First degree pairs are consumed by assignment, not relaxed.
+        if degree == 1:
+            continue
         buffer = []
-        for rel in pairwise_relations.get(degree):
-            first, second = known.get(rel[0]), known.get(rel[1])
-            relaxed = _reduce_relation(first, second)
-            buffer.append(relaxed)
-        _relax_helper(buffer, 0, [], degree_possibilities)
+        for rel in rels:
+            # Every relation endpoint is a node of the graph, so the
+            # map is indexed directly.
+            buffer.append(_reduce_relation(known[rel[0]], known[rel[1]]))
+        # Cartesian product over the per-pair alternatives, iterated
+        # in C instead of by recursion.
+        degree_possibilities = [list(combo) for combo in product(*buffer)]
         possibilities.append(degree_possibilities)
 
-    ret = []
-    _relax_helper2(possibilities, 0, {}, ret)
-    return ret
+    # Same product trick one level up: each result maps the relaxed
+    # degree position to one choice per degree.
+    return [dict(enumerate(combo, 1)) for combo in product(*possibilities)]
 
 
 def construct_graph(
@@ -856,43 +910,57 @@ def construct_graph(
             results.append(node_list)
         return
 
+    # The search allocates cyclic node graphs at a high rate, which
+    # keeps the cyclic collector busy mid-run; pause it for the span of
+    # the top-level call and collect once at the end.
+    if degree == 1 and gc.isenabled():
+        gc.disable()
+        try:
+            construct_graph(node_list, pairwise_relations, results, original_pairwise, degree)
+        finally:
+            gc.enable()
+            gc.collect()
+        return
+
     # Construct mapping for known nodes.
-    known = {}
-    for node in node_list:
-        assert(node.id not in known.keys())
-        known.update({node.id: node})
+    known = {node.id: node for node in node_list}
 
     # Edge case for extrapolation (first round)
     if degree == 1:
         for node in node_list:
-            node.extrapolate()
+            if len(node.parents) == 0:
+                node.extrapolate()
 
-    # Pipeline: assign => prune => mark => relax.
-    valid = []
-    _assign_helper(pairwise_relations.get(1), known, node_list, valid, 0)
+    # Pipeline: assign => prune => mark => relax, streamed so each
+    # candidate flows through every stage before the next is generated
+    # and no intermediate list is materialized.
+    valid = _unique_graphs(
+        _assign_helper(pairwise_relations.get(1), known, node_list, 0)
+    )
 
+    # Don't extrapolate if we've hit the end.
+    extrap = degree + 1 != MAX
     if degree == 1:
-        valid = _prune_graphs(original_pairwise.get(1), known, node_list, valid)
+        valid = _prune_graphs(original_pairwise.get(1), known, node_list, valid, extrap)
     elif degree == 2:
-        valid = _prune_graphs2(original_pairwise.get(2), known, node_list, valid)
+        valid = _prune_graphs2(original_pairwise.get(2), known, node_list, valid, extrap)
     elif degree == 3:
-        valid = _prune_graphs3(original_pairwise.get(3), known, node_list, valid)
+        valid = _prune_graphs3(original_pairwise.get(3), known, node_list, valid, extrap)
 
-    # Don't extrapolate if we've hit the end.
-    valid = _mark_and_extrapolate(valid, degree + 1 != MAX)
-    i = 0
+    # _relax_degree and the recursion below only read the relation
+    # mapping, so the children can share its lists; dropping the first
+    # degree is a spine-level comprehension, not a clone.
     for graph in valid:
-        i += 1
-        pairwise_copy = deepcopy(pairwise_relations)
-        dicts = _relax_degree(graph, pairwise_copy)
+        dicts = _relax_degree(graph, pairwise_relations)
         if degree == MAX - 1 or dicts is None or len(dicts) == 0:
-            pairwise_map = deepcopy(pairwise_relations)
-            pairwise_map.pop(1, None)
+            pairwise_map = {
+                deg: rels for deg, rels in pairwise_relations.items()
+                if deg != 1
+            }
             construct_graph(graph, pairwise_map, results, original_pairwise, degree + 1)
             continue
         for dict_pairs in dicts:
-            pairwise_map = deepcopy(dict_pairs)
-            construct_graph(graph, pairwise_map, results, original_pairwise, degree + 1)
+            construct_graph(graph, dict_pairs, results, original_pairwise, degree + 1)
 
     return
 
@@ -904,22 +972,22 @@ def deepcopy_graph(node_list: List[Node]) -> List[Node]:
     all_nodes = _visit_nodes(node_list)
     node_mapping = {}
 
+    # First pass, clone every node without its connections. All IDs in
+    # the list are unique.
     for node in all_nodes:
-        copied = deepcopy(node)
+        node_mapping[node.id] = node._shallow_clone()
 
-        # All IDs in the list should be unique.
-        assert(node.id not in node_mapping.keys())
-        node_mapping.update({node.id: copied})
-    
-    for node in node_mapping.values():
-        # Reset all connections to our copied nodes based on ID.
-        node.children = [node_mapping.get(rel.id) for rel in node.children]
-        node.partners = [node_mapping.get(rel.id) for rel in node.partners]
-        node.siblings = [node_mapping.get(rel.id) for rel in node.siblings]
+    # Second pass, rewire connections to the copied nodes based on ID.
+    # Every relative was cloned in the first pass, so the lookups index
+    # the mapping directly.
+    for node in all_nodes:
+        copied = node_mapping[node.id]
+        copied.children = [node_mapping[rel.id] for rel in node.children]
+        copied.partners = [node_mapping[rel.id] for rel in node.partners]
+        copied.siblings = [node_mapping[rel.id] for rel in node.siblings]
         if len(node.parents) > 0:
-            node.parents = (
-                node_mapping.get(node.parents[0].id),
-                node_mapping.get(node.parents[1].id)
+            copied.parents = (
+                node_mapping[node.parents[0].id],
+                node_mapping[node.parents[1].id]
             )
-    ret = [node for node in node_mapping.values()]
-    return ret
+    return list(node_mapping.values())
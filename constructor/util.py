@@ -15,7 +15,6 @@ from graphviz import Graph, Digraph, Source
 from typing import List
 from .pedigree import Node
 from os import path, remove
-from copy import deepcopy
 from colormap import rgb2hex
 
 # Configurations.
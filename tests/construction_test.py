@@ -2,6 +2,7 @@
 
 """ Tests for construction of graph only. """
 
+from copy import deepcopy
 from os import path
 from constructor.pedigree import construct_graph
 from constructor.util import parse_data
@@ -12,4 +13,6 @@ def test_simple():
     simple_degrees = path.join(dirname, './fixtures/simple_degrees.csv')
 
     node_list, mappings = parse_data(simple_bio, simple_degrees)
-    complete_nodes = construct_graph(node_list, mappings)
\ No newline at end of file
+    results = []
+    construct_graph(node_list, mappings, results, deepcopy(mappings), 1)
+    assert len(results) > 0